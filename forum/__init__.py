@@ -1,7 +1,7 @@
-from redbot.core import commands
+from redbot.core.bot import Red
 
 from .forum import Forum
 
 
-async def setup(bot: commands.Bot):
+async def setup(bot: Red):
     await bot.add_cog(Forum(bot))
@@ -1,11 +1,15 @@
 import asyncio
+import logging
 
 import discord
 from discord import Guild, Member, Role
 from pydantic import BaseModel
 from redbot.core import Config, commands
+from redbot.core.bot import Red
 from redbot.core.utils.views import ConfirmView
-from typing_extensions import Literal, overload
+from typing_extensions import Any, Literal, cast, overload
+
+log = logging.getLogger("red.ctfcogs.forum")
 
 
 class ForumGuildConfig(BaseModel):
@@ -24,15 +28,45 @@ class ForumChannelConfig(BaseModel):
     is_thread: bool = False
 
 
+class ReconcileReport(BaseModel):
+    cleared: list[int] = []
+    repaired: list[int] = []
+
+
 class Forum(commands.Cog, name="ctfcogs.Forum"):
     """A cog for creating and managing CTF channels and forums."""
 
-    def __init__(self, bot: commands.Bot):
+    SOLVED_PREFIX = "✅ "
+
+    def __init__(self, bot: Red):
         super().__init__()
         self.bot = bot
         self.config = Config.get_conf(self, 614565206, force_registration=True)
         self.config.register_guild(**ForumGuildConfig().model_dump())
         self.config.register_channel(**ForumChannelConfig().model_dump())
+        self.reconcile_task: asyncio.Task[None] | None = None
+
+    async def cog_load(self) -> None:
+        self.reconcile_task = asyncio.create_task(self.reconcile_on_load())
+
+    async def cog_unload(self) -> None:
+        if self.reconcile_task is not None:
+            self.reconcile_task.cancel()
+
+    async def reconcile_on_load(self) -> None:
+        """
+        Reconcile the channel configs once the guild cache is ready.
+        """
+        await self.bot.wait_until_red_ready()
+        report = await self.reconcile_configs()
+        if report is None:
+            log.warning("Skipped reconciling channel configs, some guilds are unavailable")
+        elif report.cleared or report.repaired:
+            log.info(
+                "Cleared %d orphaned and repaired %d channel configs",
+                len(report.cleared),
+                len(report.repaired),
+            )
 
     @commands.guild_only()
     @commands.hybrid_group()
@@ -159,13 +193,107 @@ class Forum(commands.Cog, name="ctfcogs.Forum"):
         """
         raise NotImplementedError()
 
+    async def find_challenge_threads(
+        self, config: ForumChannelConfig, challs: list[str]
+    ) -> dict[str, discord.Thread]:
+        """
+        Find the threads of challenges in a CTF.
+        Active threads are checked first, archived threads are scanned once for the rest.
+
+        Parameters
+        ----------
+        config: ForumChannelConfig
+            The config of any channel of the CTF.
+        challs: list[str]
+            The names of the challenges.
+        """
+        parent = self.bot.get_channel(
+            (config.general_id if config.is_thread else config.forum_id) or 0
+        )
+        if not isinstance(parent, (discord.TextChannel, discord.ForumChannel)):
+            return {}
+
+        remaining = set(challs)
+        found: dict[str, discord.Thread] = {}
+        for thread in parent.threads:
+            name = thread.name.removeprefix(self.SOLVED_PREFIX)
+            if name in remaining:
+                found[name] = thread
+                remaining.discard(name)
+
+        if remaining:
+            async for thread in parent.archived_threads(limit=None):
+                name = thread.name.removeprefix(self.SOLVED_PREFIX)
+                if name in remaining:
+                    found[name] = thread
+                    remaining.discard(name)
+                    if not remaining:
+                        break
+
+        return found
+
+    async def mark_solved(self, thread: discord.Thread) -> None:
+        """
+        Mark the thread of a challenge as solved.
+
+        Parameters
+        ----------
+        thread: discord.Thread
+            The thread of the challenge.
+        """
+        if thread.name.startswith(self.SOLVED_PREFIX):
+            return
+
+        # archived threads can only be edited in the same request that unarchives them
+        archived = thread.archived
+        await thread.edit(name=f"{self.SOLVED_PREFIX}{thread.name}"[:100], archived=False)
+        if archived:
+            await thread.edit(archived=True)
+
+    @commands.Cog.listener()
+    async def on_platform_challenges_solve(
+        self, channel_id: int, url: str, challs: list[str]
+    ) -> None:
+        """
+        Mark the threads of challenges solved on the platform, dispatched by the Platform cog.
+        """
+        config = ForumChannelConfig.model_validate(
+            await self.config.channel_from_id(channel_id).all()
+        )
+        if not config.is_ctf:
+            return
+
+        threads = list((await self.find_challenge_threads(config, challs)).values())
+        results = await asyncio.gather(
+            *[self.mark_solved(thread) for thread in threads], return_exceptions=True
+        )
+        for thread, result in zip(threads, results):
+            if isinstance(result, discord.HTTPException):
+                log.warning("Failed to mark thread %s as solved", thread.id, exc_info=result)
+            elif isinstance(result, BaseException):
+                raise result
+
     @forum.command()
     async def solve(self, ctx: commands.GuildContext) -> None:
         """
         Mark the current challenge as solved.
         This command should be run in the channel of the challenge.
         """
-        raise NotImplementedError()
+        thread = ctx.channel
+        if not isinstance(thread, discord.Thread) or thread.parent is None:
+            await ctx.send("This command can only be run in a challenge thread.", ephemeral=True)
+            return
+
+        config = ForumChannelConfig.model_validate(await self.config.channel(thread.parent).all())
+        if not config.is_ctf:
+            await ctx.send("This command can only be run in a CTF channel.", ephemeral=True)
+            return
+
+        await self.mark_solved(thread)
+        if ctx.interaction:
+            await ctx.send("Challenge marked as solved.", ephemeral=True)
+        else:
+            await ctx.message.add_reaction("✅")
 
     async def delete_channel_id(self, id: int):
         """
@@ -235,6 +363,135 @@ class Forum(commands.Cog, name="ctfcogs.Forum"):
         else:
             await view.message.edit(content="CTF not deleted")
 
+    async def reconcile_configs(self) -> ReconcileReport | None:
+        """
+        Compare the saved channel configs with the channels of every guild in one pass.
+        Configs of deleted channels are cleared and the links of every CTF are repaired.
+
+        Returns
+        -------
+        ReconcileReport | None
+            The ids of the cleared and repaired configs,
+            None if some guilds are unavailable and nothing was changed.
+        """
+        if any(guild.unavailable for guild in self.bot.guilds):
+            return None
+
+        channels = cast(dict[int, dict[str, Any]], await self.config.all_channels())
+        records: dict[int, ForumChannelConfig] = {
+            id: ForumChannelConfig.model_validate(data) for id, data in channels.items()
+        }
+
+        live: dict[int, discord.abc.GuildChannel | discord.Thread] = {}
+        for guild in self.bot.guilds:
+            live.update((channel.id, channel) for channel in guild.channels)
+            live.update((thread.id, thread) for thread in guild.threads)
+
+        # archived threads are not cached, look them up once per parent that has missing threads
+        missing = records.keys() - live.keys()
+        parents: dict[int, set[int]] = {}
+        for id in missing:
+            config = records[id]
+            parent_id = config.general_id if config.is_thread else config.forum_id
+            if config.is_ctf and parent_id in live:
+                if id not in (config.category_id, config.general_id, config.forum_id):
+                    parents.setdefault(parent_id, set()).add(id)
+
+        for parent_id, thread_ids in parents.items():
+            parent = live[parent_id]
+            if not isinstance(parent, (discord.TextChannel, discord.ForumChannel)):
+                continue
+            try:
+                async for thread in parent.archived_threads(limit=None):
+                    live[thread.id] = thread
+                # forum threads are always public
+                if isinstance(parent, discord.TextChannel):
+                    async for thread in parent.archived_threads(limit=None, private=True):
+                        live[thread.id] = thread
+            except discord.HTTPException:
+                # can't tell if the threads still exist, keep their configs
+                missing -= thread_ids
+
+        missing -= live.keys()
+
+        # group the channels of every CTF by their category,
+        # or by their general channel or forum if the category was deleted
+        ctfs: dict[int, set[int]] = {}
+        for id, config in records.items():
+            channel = live.get(id)
+            if channel is None or not config.is_ctf:
+                continue
+            group_id = config.category_id
+            if isinstance(channel, discord.CategoryChannel):
+                group_id = channel.id
+            elif group_id not in live:
+                parent = channel.parent if isinstance(channel, discord.Thread) else channel
+                group_id = parent.category_id if parent is not None else None
+            if group_id is None:
+                group_id = next(
+                    (i for i in (config.general_id, config.forum_id) if i in live), None
+                )
+            if group_id is not None:
+                ctfs.setdefault(group_id, set()).add(id)
+
+        fixed: dict[int, ForumChannelConfig] = {}
+        for group_id, ids in ctfs.items():
+            category = live.get(group_id)
+            if not isinstance(category, discord.CategoryChannel):
+                category = None
+
+            general_id = next(
+                (records[id].general_id for id in ids if records[id].general_id in live), None
+            )
+            if general_id is None and category is not None:
+                general = discord.utils.get(category.text_channels, name="general")
+                general_id = general.id if general else None
+
+            forum_id = next(
+                (records[id].forum_id for id in ids if records[id].forum_id in live), None
+            )
+            if forum_id is None and category is not None and category.forums:
+                forum_id = category.forums[0].id
+
+            config = ForumChannelConfig(
+                is_ctf=True,
+                category_id=category.id if category is not None else None,
+                general_id=general_id,
+                forum_id=forum_id,
+                is_thread=forum_id is None,
+            )
+            for id in ids | {config.category_id, general_id, forum_id}:
+                if id is not None and records.get(id) != config:
+                    fixed[id] = config
+
+        await asyncio.gather(
+            *[self.config.channel_from_id(id).clear() for id in missing],
+            *[
+                self.config.channel_from_id(id).set(config.model_dump())
+                for id, config in fixed.items()
+            ],
+        )
+
+        return ReconcileReport(cleared=sorted(missing), repaired=sorted(fixed))
+
+    @commands.is_owner()
+    @forum.command()
+    async def reconcile(self, ctx: commands.GuildContext) -> None:
+        """
+        Clear the configs of deleted channels and repair broken CTF links across all guilds.
+        This also runs automatically when the cog is loaded.
+        """
+        report = await self.reconcile_configs()
+        if report is None:
+            await ctx.send("Some guilds are unavailable, try again later.", ephemeral=True)
+            return
+
+        await ctx.send(
+            f"Cleared {len(report.cleared)} orphaned and repaired {len(report.repaired)} "
+            "channel configs.",
+            ephemeral=True,
+        )
+
     @forum.command()
     async def join(self, ctx: commands.GuildContext, entity: Member | Role) -> None:
         """
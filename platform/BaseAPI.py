@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
 
 from pydantic import BaseModel, ConfigDict
-from typing_extensions import Generic, Optional, TypeVar, overload
+from typing_extensions import Generic, Iterator, Optional, TypeVar, overload
 
 OptStr = Optional[str]
 
@@ -15,6 +15,16 @@ class Challenge(BaseModel):
     model_config = ConfigDict(extra="allow")
 
 
+class Standing(BaseModel):
+    pos: int
+    id: str
+    name: str
+    score: int
+    is_me: bool = False
+
+    model_config = ConfigDict(extra="allow")
+
+
 class Session(BaseModel):
     model_config = ConfigDict(extra="allow")
 
@@ -45,20 +55,24 @@ class BaseAPI(ABC, Generic[TChallenge, TSession]):
 
     @classmethod
     @overload
-    def login(cls, *, uname: str, pwd: str) -> TSession: ...
+    def login(cls, url: str, *, uname: str, pwd: str) -> TSession: ...
 
     @classmethod
     @overload
-    def login(cls, *, token: str) -> TSession: ...
+    def login(cls, url: str, *, token: str) -> TSession: ...
 
     @classmethod
     @abstractmethod
-    def login(cls, *, uname: OptStr = None, pwd: OptStr = None, token: OptStr = None) -> TSession:
+    def login(
+        cls, url: str, *, uname: OptStr = None, pwd: OptStr = None, token: OptStr = None
+    ) -> TSession:
         """
         Login to the platform
 
         Parameters
         ----------
+        url: str
+            The link to the platform to login to
         uname: str
             The username to login with
         pwd: str
@@ -120,6 +134,40 @@ class BaseAPI(ABC, Generic[TChallenge, TSession]):
             The challenge for this platform
         """
 
+    @classmethod
+    @abstractmethod
+    def get_account_id(cls, session: Session) -> str:
+        """
+        Get the id of the team, or the user, of the session on the scoreboard
+
+        Parameters
+        ----------
+        session: Session
+            The session object to use for the request
+
+        Returns
+        -------
+        str
+            The id matching `Standing.id` on the scoreboard
+        """
+
+    @classmethod
+    @abstractmethod
+    def get_scoreboard(cls, session: Session) -> Iterator[list[Standing]]:
+        """
+        Stream the standings of the scoreboard page by page
+
+        Parameters
+        ----------
+        session: Session
+            The session object to use for the requests
+
+        Yields
+        ------
+        list[Standing]
+            The next page of standings, in order of position
+        """
+
     @classmethod
     @abstractmethod
     def submit_flag(cls, session: Session, challenge: Challenge, flag: str) -> bool:
@@ -0,0 +1,288 @@
+import json
+import re
+from http.client import HTTPException
+from http.cookiejar import CookieJar
+from urllib.error import HTTPError
+from urllib.parse import urlencode, urlsplit, urlunsplit
+from urllib.request import HTTPCookieProcessor, Request, build_opener, urlopen
+
+from typing_extensions import Any, Iterator, Literal, Optional
+
+from .BaseAPI import BaseAPI, Challenge, OptStr, Session, Standing
+
+CSRF_NONCE_RE = re.compile(r"""csrfNonce['"]?\s*:\s*['"]([^'"]+)['"]""")
+LOGIN_NONCE_RE = re.compile(r"""<input[^>]*?name=['"]nonce['"][^>]*?>""")
+VALUE_RE = re.compile(r"""value=['"]([^'"]+)['"]""")
+
+
+class CTFdError(Exception):
+    """The CTFd instance rejected a request"""
+
+
+class CTFdChallenge(Challenge):
+    category: str = ""
+    points: int = 0
+    solves: int = 0
+
+
+class CTFdSession(Session):
+    url: str
+    token: OptStr = None
+    cookies: dict[str, str] = {}
+    nonce: OptStr = None
+    mode: Optional[Literal["teams", "users"]] = None
+    account_id: OptStr = None
+
+
+class CTFdAPI(BaseAPI[CTFdChallenge, CTFdSession]):
+    """
+    API wrapper for CTFd
+
+    The board is built from the challenge list and a single solves request,
+    descriptions are only fetched when a challenge is requested by id.
+    """
+
+    TIMEOUT = 30
+
+    @staticmethod
+    def base_url(link: str) -> str:
+        """
+        Get the root of the CTFd instance from any link to one of its pages
+        """
+        parts = urlsplit(link if "://" in link else f"https://{link}")
+        path = parts.path.rstrip("/")
+        for page in ("/challenges", "/login", "/scoreboard"):
+            path = path.removesuffix(page)
+        return urlunsplit((parts.scheme, parts.netloc, path, "", ""))
+
+    @classmethod
+    def request(
+        cls,
+        session: CTFdSession,
+        method: Literal["GET", "POST"],
+        path: str,
+        data: Optional[dict[str, Any]] = None,
+        params: Optional[dict[str, Any]] = None,
+    ) -> dict[str, Any]:
+        """
+        Send a request to the CTFd API, authenticated with the token or cookies of the session
+
+        Returns
+        -------
+        dict[str, Any]
+            The decoded response
+
+        Raises
+        ------
+        CTFdError
+            If the response is not successful
+        """
+        headers = {"Accept": "application/json"}
+        if session.token:
+            # CTFd rejects token authenticated requests that are not sent as JSON
+            headers["Authorization"] = f"Token {session.token}"
+            headers["Content-Type"] = "application/json"
+        if session.cookies:
+            headers["Cookie"] = "; ".join(f"{k}={v}" for k, v in session.cookies.items())
+
+        body = None
+        if data is not None:
+            body = json.dumps(data).encode()
+            headers["Content-Type"] = "application/json"
+            if session.nonce:
+                headers["CSRF-Token"] = session.nonce
+
+        url = f"{session.url}{path}"
+        if params:
+            url = f"{url}?{urlencode(params)}"
+
+        req = Request(url, data=body, headers=headers, method=method)
+        with urlopen(req, timeout=cls.TIMEOUT) as resp:
+            payload: dict[str, Any] = json.load(resp)
+
+        if not payload.get("success", True):
+            raise CTFdError(payload.get("errors") or payload.get("message") or payload)
+        return payload
+
+    @classmethod
+    def verify(cls, link: str) -> bool:
+        try:
+            with urlopen(cls.base_url(link) + "/", timeout=cls.TIMEOUT) as resp:
+                page = resp.read().decode(errors="replace")
+        except (OSError, ValueError, HTTPException):
+            return False
+        return "csrfNonce" in page and "CTFd" in page
+
+    @classmethod
+    def login(
+        cls, url: str, *, uname: OptStr = None, pwd: OptStr = None, token: OptStr = None
+    ) -> CTFdSession:
+        session = CTFdSession(url=cls.base_url(url))
+
+        if token is not None:
+            session.token = token
+            return session
+
+        if uname is None or pwd is None:
+            raise ValueError("Either a token or a username and password is required")
+
+        jar = CookieJar()
+        opener = build_opener(HTTPCookieProcessor(jar))
+        with opener.open(f"{session.url}/login", timeout=cls.TIMEOUT) as resp:
+            page = resp.read().decode(errors="replace")
+
+        field = LOGIN_NONCE_RE.search(page)
+        nonce = field and VALUE_RE.search(field.group(0))
+        if not nonce:
+            raise CTFdError("Could not find the login nonce")
+
+        form = urlencode(
+            {"name": uname, "password": pwd, "nonce": nonce.group(1), "_submit": "Submit"}
+        ).encode()
+        with opener.open(f"{session.url}/login", data=form, timeout=cls.TIMEOUT) as resp:
+            page = resp.read().decode(errors="replace")
+            landed = urlsplit(str(resp.geturl())).path
+
+        csrf = CSRF_NONCE_RE.search(page)
+        if landed.endswith("/login") or not csrf:
+            raise CTFdError("Login failed, check the username and password")
+
+        session.cookies = {cookie.name: cookie.value or "" for cookie in jar}
+        session.nonce = csrf.group(1)
+        return session
+
+    @classmethod
+    def logout(cls, session: Session) -> None:
+        session = CTFdSession.model_validate(session, from_attributes=True)
+        if session.cookies:
+            headers = {"Cookie": "; ".join(f"{k}={v}" for k, v in session.cookies.items())}
+            with urlopen(Request(f"{session.url}/logout", headers=headers), timeout=cls.TIMEOUT):
+                pass
+
+    @classmethod
+    def request_me(cls, session: CTFdSession, path: str = "") -> Any:
+        """
+        Request an endpoint of the team, or the user in user mode
+
+        The mode is detected on the first call and saved in the session
+
+        Parameters
+        ----------
+        path: str
+            The path below `/api/v1/teams/me`
+
+        Returns
+        -------
+        Any
+            The data of the response
+        """
+        modes: list[Literal["teams", "users"]] = (
+            [session.mode] if session.mode else ["teams", "users"]
+        )
+        for mode in modes:
+            try:
+                data = cls.request(session, "GET", f"/api/v1/{mode}/me{path}")["data"]
+            except HTTPError as e:
+                if e.code == 401 or not 400 <= e.code < 500:
+                    raise
+                continue
+            session.mode = mode
+            return data
+
+        raise CTFdError("Could not find the team or user of the session")
+
+    @classmethod
+    def get_solves(cls, session: CTFdSession) -> set[str]:
+        """
+        Get the ids of the challenges solved by the team, or the user in user mode
+        """
+        return {str(solve["challenge_id"]) for solve in cls.request_me(session, "/solves")}
+
+    @staticmethod
+    def to_challenge(data: dict[str, Any], is_solved: bool) -> CTFdChallenge:
+        return CTFdChallenge(
+            id=str(data["id"]),
+            name=data["name"],
+            is_solved=is_solved,
+            description=data.get("description"),
+            flag=None,
+            category=data.get("category") or "",
+            points=data.get("value") or 0,
+            solves=data.get("solves") or 0,
+        )
+
+    @classmethod
+    def get_challenges(cls, session: Session) -> list[CTFdChallenge]:
+        session = CTFdSession.model_validate(session, from_attributes=True)
+        data = [
+            chall
+            for chall in cls.request(session, "GET", "/api/v1/challenges")["data"]
+            if chall.get("type") != "hidden"
+        ]
+
+        # newer CTFd versions include the solve state in the list, skip the solves request
+        if all("solved_by_me" in chall for chall in data):
+            solved = {str(chall["id"]) for chall in data if chall["solved_by_me"]}
+        else:
+            solved = cls.get_solves(session)
+
+        return [cls.to_challenge(chall, str(chall["id"]) in solved) for chall in data]
+
+    @classmethod
+    def get_challenge(cls, id: str, session: Session) -> CTFdChallenge:
+        session = CTFdSession.model_validate(session, from_attributes=True)
+        data = cls.request(session, "GET", f"/api/v1/challenges/{id}")["data"]
+        if "solved_by_me" in data:
+            is_solved = bool(data["solved_by_me"])
+        else:
+            is_solved = str(data["id"]) in cls.get_solves(session)
+        return cls.to_challenge(data, is_solved)
+
+    @classmethod
+    def get_account_id(cls, session: Session) -> str:
+        session = CTFdSession.model_validate(session, from_attributes=True)
+        if session.account_id is None:
+            session.account_id = str(cls.request_me(session)["id"])
+        return session.account_id
+
+    @classmethod
+    def get_scoreboard(cls, session: Session) -> Iterator[list[Standing]]:
+        session = CTFdSession.model_validate(session, from_attributes=True)
+        account_id = cls.get_account_id(session)
+
+        page: Optional[int] = 1
+        while page is not None:
+            # CTFd versions without pagination ignore the page and return every standing at once
+            payload = cls.request(session, "GET", "/api/v1/scoreboard", params={"page": page})
+            yield [
+                Standing(
+                    pos=entry["pos"],
+                    id=str(entry["account_id"]),
+                    name=entry["name"],
+                    score=entry["score"],
+                    is_me=str(entry["account_id"]) == account_id,
+                )
+                for entry in payload["data"]
+            ]
+            page = payload.get("meta", {}).get("pagination", {}).get("next")
+
+    @classmethod
+    def submit_flag(cls, session: Session, challenge: Challenge, flag: str) -> bool:
+        session = CTFdSession.model_validate(session, from_attributes=True)
+        data = cls.request(
+            session,
+            "POST",
+            "/api/v1/challenges/attempt",
+            {"challenge_id": int(challenge.id), "submission": flag},
+        )["data"]
+        return data["status"] in ("correct", "already_solved")
+
+    @classmethod
+    def submit_flags(
+        cls, session: Session, challenges: list[Challenge], flags: list[str]
+    ) -> list[bool]:
+        if len(challenges) != len(flags):
+            raise ValueError("The number of challenges and flags do not match")
+        return [
+            cls.submit_flag(session, challenge, flag) for challenge, flag in zip(challenges, flags)
+        ]
@@ -0,0 +1,282 @@
+"""
+A local CTFd compatible server to test the CTFd API offline
+
+Usage: python platform/CTFdMock.py [--port 8000] [--challenges 2000] [--solved 100] [--teams 2500]
+                                   [--legacy]
+
+Login with the username `user` and password `password`, or the token `mock-token`.
+The flag of every challenge is `flag{<id>}`.
+`--legacy` leaves `solved_by_me` out of the challenge list, like older CTFd versions.
+The scoreboard is paginated and the team of the session is `mock-team`, which starts mid-board.
+Request counts per endpoint are served at /mock/stats.
+"""
+
+import argparse
+import json
+import re
+import secrets
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from typing_extensions import Any, Optional, cast
+
+USERNAME = "user"
+PASSWORD = "password"
+TOKEN = "mock-token"
+TEAM_ID = 1
+CATEGORIES = ["web", "pwn", "crypto", "rev", "forensics", "misc"]
+SCOREBOARD_PAGE = 500
+
+PAGE = """<!DOCTYPE html>
+<html>
+<head><title>Mock CTFd</title>
+<script>var init = {{'urlRoot': "", 'csrfNonce': "{nonce}", 'userMode': "teams"}}</script>
+</head>
+<body>{body}<footer>Powered by CTFd</footer></body>
+</html>
+"""
+
+LOGIN_FORM = """<form method="post">
+<input name="name" type="text"><input name="password" type="password">
+<input id="nonce" name="nonce" type="hidden" value="{nonce}">
+<input id="_submit" name="_submit" type="submit" value="Submit">
+</form>{error}"""
+
+
+class MockCTFd:
+    """The state of the mock CTFd instance"""
+
+    def __init__(self, challenges: int, solved: int, teams: int = 2500, legacy: bool = False):
+        self.legacy = legacy
+        self.challenges: dict[int, dict[str, Any]] = {
+            id: {
+                "id": id,
+                "type": "standard",
+                "name": f"challenge-{id}",
+                "value": 100 + id % 10 * 50,
+                "solves": (challenges - id) % 97,
+                "category": CATEGORIES[id % len(CATEGORIES)],
+                "description": f"Description of challenge {id}",
+                "tags": [],
+            }
+            for id in range(1, challenges + 1)
+        }
+        self.solved: set[int] = set(range(1, min(solved, challenges) + 1))
+        # spread the other teams evenly up to twice our starting score, so we land mid-board
+        span = 2 * max(sum(self.challenges[id]["value"] for id in self.solved), 1000)
+        self.teams: dict[int, dict[str, Any]] = {
+            id: {"id": id, "name": f"team-{id}", "score": id * 7919 % teams * span // teams}
+            for id in range(2, teams + 1)
+        }
+        self.teams[TEAM_ID] = {"id": TEAM_ID, "name": "mock-team", "score": 0}
+        self.sessions: dict[str, str] = {}
+        self.requests: Counter[str] = Counter()
+        self.lock = threading.Lock()
+
+    def challenge(self, id: int, detail: bool = False) -> dict[str, Any]:
+        data = dict(self.challenges[id])
+        if not detail:
+            del data["description"]
+        if detail or not self.legacy:
+            data["solved_by_me"] = id in self.solved
+        return data
+
+    def standings(self) -> list[dict[str, Any]]:
+        with self.lock:
+            score = sum(self.challenges[id]["value"] for id in self.solved)
+            self.teams[TEAM_ID]["score"] = score
+            teams = sorted(self.teams.values(), key=lambda team: (-team["score"], team["id"]))
+        return [
+            {
+                "pos": pos,
+                "account_id": team["id"],
+                "account_type": "team",
+                "name": team["name"],
+                "score": team["score"],
+            }
+            for pos, team in enumerate(teams, 1)
+        ]
+
+
+class Handler(BaseHTTPRequestHandler):
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    @property
+    def ctfd(self) -> MockCTFd:
+        return cast(MockServer, self.server).ctfd
+
+    def send(self, status: int, body: Any, headers: Optional[dict[str, str]] = None) -> None:
+        if isinstance(body, str):
+            content, content_type = body.encode(), "text/html; charset=utf-8"
+        else:
+            content, content_type = json.dumps(body).encode(), "application/json"
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(content)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def redirect(self, location: str, headers: Optional[dict[str, str]] = None) -> None:
+        self.send_response(302)
+        self.send_header("Location", location)
+        self.send_header("Content-Length", "0")
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+
+    def cookie(self) -> Optional[str]:
+        match = re.search(r"session=([^;]+)", self.headers.get("Cookie", ""))
+        if match and match.group(1) in self.ctfd.sessions:
+            return match.group(1)
+        return None
+
+    def page(self, body: str = "", nonce: Optional[str] = None) -> str:
+        return PAGE.format(nonce=nonce or secrets.token_hex(32), body=body)
+
+    def authorized(self, method: str) -> bool:
+        if self.headers.get("Authorization") == f"Token {TOKEN}":
+            # like CTFd, tokens are only accepted on JSON requests
+            return self.headers.get("Content-Type", "").startswith("application/json")
+        cookie = self.cookie()
+        if cookie is None:
+            return False
+        return method == "GET" or self.headers.get("CSRF-Token") == self.ctfd.sessions[cookie]
+
+    def body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def do_GET(self) -> None:
+        self.route("GET")
+
+    def do_POST(self) -> None:
+        self.route("POST")
+
+    def route(self, method: str) -> None:
+        url = urlsplit(self.path)
+        path = url.path.rstrip("/") or "/"
+        query = parse_qs(url.query)
+        endpoint = re.sub(r"/\d+", "/<id>", path)
+        with self.ctfd.lock:
+            self.ctfd.requests[f"{method} {endpoint}"] += 1
+
+        if path == "/mock/stats":
+            return self.send(200, dict(self.ctfd.requests))
+
+        if path.startswith("/api/v1"):
+            if not self.authorized(method):
+                return self.send(403, {"success": False, "errors": ["Forbidden"]})
+            return self.api(method, path.removeprefix("/api/v1"), query)
+
+        if path == "/login" and method == "POST":
+            form = parse_qs(self.body().decode())
+            if form.get("name") == [USERNAME] and form.get("password") == [PASSWORD]:
+                cookie = secrets.token_hex(16)
+                self.ctfd.sessions[cookie] = secrets.token_hex(32)
+                return self.redirect("/challenges", {"Set-Cookie": f"session={cookie}; Path=/"})
+            error = "<div>Your username or password is incorrect</div>"
+            return self.send(200, self.page(LOGIN_FORM.format(nonce="login", error=error)))
+
+        if path == "/login":
+            return self.send(200, self.page(LOGIN_FORM.format(nonce="login", error="")))
+
+        if path == "/logout":
+            cookie = self.cookie()
+            if cookie is not None:
+                del self.ctfd.sessions[cookie]
+            return self.redirect("/")
+
+        cookie = self.cookie()
+        nonce = self.ctfd.sessions[cookie] if cookie else None
+        return self.send(200, self.page(nonce=nonce))
+
+    def api(self, method: str, path: str, query: dict[str, list[str]]) -> None:
+        ctfd = self.ctfd
+
+        if method == "GET" and path == "/challenges":
+            data = [ctfd.challenge(id) for id in ctfd.challenges]
+            return self.send(200, {"success": True, "data": data})
+
+        if method == "GET" and (match := re.fullmatch(r"/challenges/(\d+)", path)):
+            id = int(match.group(1))
+            if id not in ctfd.challenges:
+                return self.send(404, {"success": False, "errors": ["Not found"]})
+            return self.send(200, {"success": True, "data": ctfd.challenge(id, detail=True)})
+
+        if method == "GET" and path == "/teams/me":
+            standings = ctfd.standings()
+            place = next(s["pos"] for s in standings if s["account_id"] == TEAM_ID)
+            data = {**ctfd.teams[TEAM_ID], "place": place}
+            return self.send(200, {"success": True, "data": data})
+
+        if method == "GET" and path == "/scoreboard":
+            standings = ctfd.standings()
+            pages = max(1, -(-len(standings) // SCOREBOARD_PAGE))
+            page = min(max(int(query.get("page", ["1"])[0]), 1), pages)
+            data = standings[(page - 1) * SCOREBOARD_PAGE : page * SCOREBOARD_PAGE]
+            pagination = {
+                "page": page,
+                "next": page + 1 if page < pages else None,
+                "prev": page - 1 if page > 1 else None,
+                "pages": pages,
+                "per_page": SCOREBOARD_PAGE,
+                "total": len(standings),
+            }
+            return self.send(
+                200, {"success": True, "data": data, "meta": {"pagination": pagination}}
+            )
+
+        if method == "GET" and path == "/teams/me/solves":
+            data = [{"challenge_id": id, "type": "correct"} for id in sorted(ctfd.solved)]
+            return self.send(200, {"success": True, "data": data})
+
+        if method == "POST" and path == "/challenges/attempt":
+            request = json.loads(self.body())
+            id = int(request["challenge_id"])
+            if id not in ctfd.challenges:
+                return self.send(404, {"success": False, "errors": ["Not found"]})
+            if id in ctfd.solved:
+                status = "already_solved"
+            elif request["submission"] == f"flag{{{id}}}":
+                status = "correct"
+                with ctfd.lock:
+                    ctfd.solved.add(id)
+                    ctfd.challenges[id]["solves"] += 1
+            else:
+                status = "incorrect"
+            return self.send(200, {"success": True, "data": {"status": status, "message": ""}})
+
+        return self.send(404, {"success": False, "errors": ["Not found"]})
+
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], ctfd: MockCTFd):
+        super().__init__(address, Handler)
+        self.ctfd = ctfd
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a local CTFd compatible server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--challenges", type=int, default=2000)
+    parser.add_argument("--solved", type=int, default=100)
+    parser.add_argument("--teams", type=int, default=2500)
+    parser.add_argument("--legacy", action="store_true")
+    args = parser.parse_args()
+
+    ctfd = MockCTFd(args.challenges, args.solved, args.teams, args.legacy)
+    server = MockServer((args.host, args.port), ctfd)
+    print(f"Mock CTFd running on http://{args.host}:{args.port}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
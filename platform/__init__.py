@@ -1,7 +1,7 @@
 from platform.platform import Platform
 
-from redbot.core import commands
+from redbot.core.bot import Red
 
 
-async def setup(bot: commands.Bot):
+async def setup(bot: Red):
     await bot.add_cog(Platform(bot))
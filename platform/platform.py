@@ -1,21 +1,457 @@
-from redbot.core import Config, commands
-from typing_extensions import Literal, Optional
+import asyncio
+import logging
+import random
+import time
 
-from .BaseAPI import BaseAPI
+import discord
+from pydantic import BaseModel
+from redbot.core import Config, commands
+from redbot.core.bot import Red
+from redbot.core.utils.chat_formatting import box, pagify
+from typing_extensions import Any, Literal, Optional, cast
+
+from .BaseAPI import BaseAPI, Challenge, Session, Standing
+from .CTFdAPI import CTFdAPI, CTFdError
+from .poller import (
+    ACTIVE_INTERVAL,
+    JITTER,
+    ChallengeEvent,
+    PollState,
+    diff_challenges,
+    format_events,
+    is_active,
+    jitter,
+    next_interval,
+)
+from .scoreboard import SCOREBOARD_TTL, ScoreboardCache, format_scoreboard
 
 OptStr = Optional[str]
+PlatformKey = tuple[str, int]
+
+log = logging.getLogger("red.ctfcogs.platform")
+
+
+class PlatformConfig(BaseModel):
+    uname: OptStr = None
+    pwd: OptStr = None
+    token: OptStr = None
+    poll: bool = False
+    start: Optional[float] = None
+    end: Optional[float] = None
+
+
+class PlatformChannelConfig(BaseModel):
+    url: OptStr = None
+    platforms: dict[str, PlatformConfig] = {}
 
 
 class Platform(commands.Cog, name="ctfcogs.Platform"):
     """A cog that manages interaction with CTF Platforms"""
 
-    APIS: list[type[BaseAPI]] = []
+    APIS: list[type[BaseAPI]] = [CTFdAPI]
+
+    # events of a channel are merged into at most one announcement per interval
+    ANNOUNCE_INTERVAL = ACTIVE_INTERVAL
+    # the poller rescans the config for new platforms at least this often
+    RESCAN_INTERVAL = 60.0
+    MAX_CONCURRENT_POLLS = 4
 
-    def __init__(self, bot: commands.Bot):
+    def __init__(self, bot: Red):
         super().__init__()
         self.bot = bot
         self.config = Config.get_conf(self, 4042795926, force_registration=True)
+        self.config.register_channel(**PlatformChannelConfig().model_dump())
+        # snapshots are kept apart from the channel data so rescans don't load them
+        self.config.init_custom("SNAPSHOT", 2)
+        self.config.register_custom("SNAPSHOT", challenges=None)
+
+        self.apis: dict[str, type[BaseAPI]] = {}
+        self.sessions: dict[PlatformKey, Session] = {}
+        self.poll_states: dict[PlatformKey, PollState] = {}
+        self.active: Optional[dict[PlatformKey, PlatformConfig]] = None
+        self.last_rescan = 0.0
+        self.swept_snapshots = False
+        self.snapshots: dict[PlatformKey, Optional[dict[str, Challenge]]] = {}
+        self.poll_wakeup = asyncio.Event()
+        self.poll_semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_POLLS)
+        self.poll_task: Optional[asyncio.Task[None]] = None
+        self.pending: dict[int, list[ChallengeEvent]] = {}
+        self.last_announce: dict[int, float] = {}
+        self.scoreboards: dict[str, ScoreboardCache] = {}
+        self.scoreboard_locks: dict[str, asyncio.Lock] = {}
+        # id of our team on the scoreboard per key, looked up once with its own session
+        self.scoreboard_teams: dict[PlatformKey, str] = {}
+
+    async def cog_load(self) -> None:
+        self.poll_task = asyncio.create_task(self.poll_loop())
+
+    async def cog_unload(self) -> None:
+        if self.poll_task is not None:
+            self.poll_task.cancel()
+
+    async def get_api(self, url: str) -> Optional[type[BaseAPI]]:
+        """
+        Identify the platform API for the given URL, results are cached
+
+        Parameters
+        ----------
+        url: str
+            The URL of the platform
+
+        Returns
+        -------
+        type[BaseAPI], optional
+            The API class of the platform, None if no API supports the URL
+        """
+        if url not in self.apis:
+            for api in self.APIS:
+                if await asyncio.to_thread(api.verify, url):
+                    self.apis[url] = api
+                    break
+            else:
+                return None
+        return self.apis[url]
+
+    async def get_platform(self, channel_id: int, url: str) -> PlatformConfig:
+        """
+        Get the saved data of a platform for a channel
+
+        Parameters
+        ----------
+        channel_id: int
+            The ID of the channel the platform is bound to
+        url: str
+            The URL of the platform
+        """
+        platforms = await self.config.channel_from_id(channel_id).platforms()
+        return PlatformConfig.model_validate(platforms.get(url, {}))
+
+    async def set_platform(self, channel_id: int, url: str, platform: PlatformConfig) -> None:
+        """
+        Save the data of a platform for a channel
+
+        Parameters
+        ----------
+        channel_id: int
+            The ID of the channel the platform is bound to
+        url: str
+            The URL of the platform
+        platform: PlatformConfig
+            The data to save
+        """
+        await self.config.channel_from_id(channel_id).set_raw(
+            "platforms", url, value=platform.model_dump()
+        )
+
+    async def get_session(
+        self, key: PlatformKey, api: type[BaseAPI], platform: PlatformConfig
+    ) -> Session:
+        """
+        Get the session bound to key=(url, channel), logging in with saved credentials if needed
+
+        Raises
+        ------
+        ValueError
+            If no session exists and no credentials are saved
+        """
+        if key not in self.sessions:
+            url = key[0]
+            if platform.token:
+                session = await asyncio.to_thread(api.login, url, token=platform.token)
+            elif platform.uname and platform.pwd:
+                session = await asyncio.to_thread(
+                    api.login, url, uname=platform.uname, pwd=platform.pwd
+                )
+            else:
+                raise ValueError(f"No credentials saved for {url}")
+            self.sessions[key] = session
+        return self.sessions[key]
+
+    async def get_scoreboard(
+        self, key: PlatformKey, api: type[BaseAPI], platform: PlatformConfig
+    ) -> tuple[ScoreboardCache, Optional[int]]:
+        """
+        Get the scoreboard of a platform, cached per platform for SCOREBOARD_TTL seconds
+
+        Concurrent calls for the same platform share a single fetch,
+        and pages are consumed as they are streamed by the API.
+        Our team is looked up once per key=(url, channel) and found in the cached positions.
+
+        Parameters
+        ----------
+        key: tuple[str, int]
+            The (url, channel) whose session is used if the scoreboard has to be fetched
+        api: type[BaseAPI]
+            The API of the platform
+        platform: PlatformConfig
+            The saved data of the platform
+
+        Returns
+        -------
+        tuple[ScoreboardCache, int | None]
+            The scoreboard and the index of our team in it, None if it is not on the scoreboard
+        """
+        url = key[0]
+        async with self.scoreboard_locks.setdefault(url, asyncio.Lock()):
+            if key not in self.scoreboard_teams:
+                session = await self.get_session(key, api, platform)
+                team = await asyncio.to_thread(api.get_account_id, session)
+                self.scoreboard_teams[key] = team
+
+            cache = self.scoreboards.get(url)
+            if cache is None or time.monotonic() - cache.fetched_at >= SCOREBOARD_TTL:
+                session = await self.get_session(key, api, platform)
+                pages = api.get_scoreboard(session)
+                standings: list[Standing] = []
+                positions: dict[str, int] = {}
+                while (page := await asyncio.to_thread(next, pages, None)) is not None:
+                    for standing in page:
+                        positions[standing.id] = len(standings)
+                        standings.append(standing)
+
+                cache = ScoreboardCache(
+                    fetched_at=time.monotonic(), standings=standings, positions=positions
+                )
+                self.scoreboards[url] = cache
+
+            return cache, cache.positions.get(self.scoreboard_teams[key])
+
+    async def resolve_url(self, ctx: commands.GuildContext, url: OptStr) -> OptStr:
+        """
+        Get the given URL or the default URL of the channel, notifying the user if neither exist
+        """
+        url = url or await self.config.channel(ctx.channel).url()
+        if url is None:
+            await ctx.send("No URL given and no default URL set for this channel.", ephemeral=True)
+        return url
+
+    async def poll_loop(self) -> None:
+        """
+        Single scheduler that polls every active key=(url, channel) when it is due
+        """
+        await self.bot.wait_until_red_ready()
+        while True:
+            try:
+                await self.poll_due()
+                await self.announce()
+            except Exception:
+                log.exception("Platform poller failed")
+
+            now = time.monotonic()
+            wake = min(
+                [state.due for state in self.poll_states.values()]
+                + [
+                    self.last_announce.get(channel_id, now) + self.ANNOUNCE_INTERVAL
+                    for channel_id in self.pending
+                ],
+                default=now + self.RESCAN_INTERVAL,
+            )
+            try:
+                await asyncio.wait_for(
+                    self.poll_wakeup.wait(), min(max(wake - now, 1.0), self.RESCAN_INTERVAL)
+                )
+            except asyncio.TimeoutError:
+                pass
+            self.poll_wakeup.clear()
+
+    def rescan(self) -> None:
+        """
+        Reload the active platforms from the config and wake up the poller
+        """
+        self.active = None
+        self.poll_wakeup.set()
 
+    async def poll_due(self) -> None:
+        """
+        Poll every active platform whose interval has elapsed
+        """
+        now = time.monotonic()
+        if self.active is None or now - self.last_rescan >= self.RESCAN_INTERVAL:
+            channels = cast(dict[int, dict[str, Any]], await self.config.all_channels())
+            active: dict[PlatformKey, PlatformConfig] = {}
+            for channel_id, data in channels.items():
+                # deleted channels stop polling, so their snapshots are cleared below
+                if self.bot.get_channel(channel_id) is None:
+                    continue
+                channel = PlatformChannelConfig.model_validate(data)
+                for url, platform in channel.platforms.items():
+                    if platform.poll:
+                        active[(url, channel_id)] = platform
+            self.active, self.last_rescan = active, now
+
+            if not self.swept_snapshots:
+                # snapshots of platforms disabled while the cog was unloaded
+                self.swept_snapshots = True
+                snapshots = cast(
+                    dict[str, dict[str, Any]], await self.config.custom("SNAPSHOT").all()
+                )
+                await asyncio.gather(
+                    *[
+                        self.clear_snapshot((url, int(channel_id)))
+                        for url, channel_ids in snapshots.items()
+                        for channel_id in channel_ids
+                        if (url, int(channel_id)) not in active
+                    ]
+                )
+
+        active = self.active
+        for key in self.poll_states.keys() - active.keys():
+            del self.poll_states[key]
+            await self.clear_snapshot(key)
+
+        due: list[PlatformKey] = []
+        for key, platform in active.items():
+            if key not in self.poll_states:
+                # spread out the first polls so enabling many platforms doesn't burst,
+                # CTFs that haven't started are scheduled right away to record their baseline
+                first = now + random.uniform(0, JITTER * ACTIVE_INTERVAL)
+                if platform.start is not None and time.time() < platform.start:
+                    first = now
+                self.poll_states[key] = PollState(due=first)
+            state = self.poll_states[key]
+            if platform.start is not None and time.time() < platform.start:
+                # don't let a backed off interval or an edited start skip past the release
+                latest = now + platform.start - time.time() + JITTER * ACTIVE_INTERVAL
+                state.due = min(state.due, latest)
+            if state.due <= now:
+                due.append(key)
+
+        await asyncio.gather(*[self.poll_key(key, active[key]) for key in due])
+
+    async def clear_snapshot(self, key: PlatformKey) -> None:
+        """
+        Forget the challenge snapshot of a key=(url, channel) that is no longer polled
+        """
+        self.snapshots.pop(key, None)
+        await self.config.custom("SNAPSHOT", key[0], str(key[1])).clear()
+
+    async def get_snapshot(self, key: PlatformKey) -> Optional[dict[str, Challenge]]:
+        """
+        Get the last challenge snapshot of a key=(url, channel), loading it once from the config
+
+        Returns
+        -------
+        dict[str, Challenge], optional
+            The snapshot keyed by challenge id, None if the board was never polled
+        """
+        if key not in self.snapshots:
+            config = self.config.custom("SNAPSHOT", key[0], str(key[1]))
+            saved: Optional[dict[str, dict[str, Any]]] = await config.challenges()
+            self.snapshots[key] = None
+            if saved is not None:
+                self.snapshots[key] = {
+                    id: Challenge(id=id, flag=None, **data) for id, data in saved.items()
+                }
+        return self.snapshots[key]
+
+    async def poll_key(self, key: PlatformKey, platform: PlatformConfig) -> None:
+        """
+        Poll a single platform and schedule its next poll
+        """
+        state = self.poll_states[key]
+        until_start = platform.start - time.time() if platform.start is not None else 0.0
+        if until_start > 0:
+            # the board is usually closed before the start, so don't poll until it opens.
+            # an empty baseline makes the challenges released at the start show up as new
+            if await self.get_snapshot(key) is None:
+                self.snapshots[key] = {}
+            spread = random.uniform(0, JITTER * ACTIVE_INTERVAL)
+            state.due = time.monotonic() + until_start + spread
+            return
+
+        changed = False
+        async with self.poll_semaphore:
+            try:
+                changed = await self.poll_platform(key, platform)
+            except Exception:
+                log.warning("Failed to poll %s for channel %s", *key, exc_info=True)
+                self.sessions.pop(key, None)
+
+        state.interval = next_interval(
+            state.interval, is_active(platform.start, platform.end, time.time()), changed
+        )
+        state.due = time.monotonic() + jitter(state.interval)
+
+    async def poll_platform(self, key: PlatformKey, platform: PlatformConfig) -> bool:
+        """
+        Fetch the challenges of a platform, queue the differences to the last snapshot for
+        announcement and save the new snapshot
+
+        Parameters
+        ----------
+        key: tuple[str, int]
+            The (url, channel) to poll
+        platform: PlatformConfig
+            The saved data of the platform
+
+        Returns
+        -------
+        bool
+            True if anything changed since the last poll
+        """
+        url, channel_id = key
+        api = await self.get_api(url)
+        if api is None:
+            raise ValueError(f"Unsupported platform: {url}")
+
+        session = await self.get_session(key, api, platform)
+        challenges = await asyncio.to_thread(api.get_challenges, session)
+
+        old = await self.get_snapshot(key)
+        events = diff_challenges(url, old, challenges)
+
+        # only keep the fields the diff uses, descriptions fetched separately are kept
+        snapshot: dict[str, Challenge] = {}
+        for challenge in challenges:
+            description = challenge.description
+            if description is None and old is not None and challenge.id in old:
+                description = old[challenge.id].description
+            snapshot[challenge.id] = Challenge(
+                id=challenge.id,
+                name=challenge.name,
+                is_solved=challenge.is_solved,
+                description=description,
+                flag=None,
+            )
+        self.snapshots[key] = snapshot
+
+        # solve counts and points change constantly, only write when the diff fields did
+        if old is None or events or old.keys() != snapshot.keys():
+            await self.config.custom("SNAPSHOT", url, str(channel_id)).challenges.set(
+                {id: c.model_dump(exclude={"id", "flag"}) for id, c in snapshot.items()}
+            )
+
+        solved = [event.challenge.name for event in events if event.kind == "solved"]
+        if solved:
+            self.bot.dispatch("platform_challenges_solve", channel_id, url, solved)
+        if events:
+            self.pending.setdefault(channel_id, []).extend(events)
+
+        return bool(events)
+
+    async def announce(self) -> None:
+        """
+        Send one merged announcement to every channel with pending events
+        """
+        now = time.monotonic()
+        for channel_id in list(self.pending):
+            last = self.last_announce.get(channel_id)
+            if last is not None and now - last < self.ANNOUNCE_INTERVAL:
+                continue
+
+            events = self.pending.pop(channel_id)
+            channel = self.bot.get_channel(channel_id)
+            if not isinstance(channel, discord.abc.Messageable):
+                continue
+
+            self.last_announce[channel_id] = now
+            try:
+                for page in pagify(format_events(events)):
+                    await channel.send(page)
+            except discord.HTTPException:
+                log.warning("Failed to announce in channel %s", channel_id, exc_info=True)
+
+    @commands.guild_only()
     @commands.hybrid_group()
     async def platform(self, ctx: commands.Context):
         """
@@ -48,7 +484,7 @@ class Platform(commands.Cog, name="ctfcogs.Platform"):
         raise NotImplementedError()
 
     @platform.command()
-    async def url(self, ctx: commands.Context, url: str) -> None:
+    async def url(self, ctx: commands.GuildContext, url: str) -> None:
         """
         Identify and set the default URL of the platform for the current channel
 
@@ -57,12 +493,20 @@ class Platform(commands.Cog, name="ctfcogs.Platform"):
         url: str
             The URL to save
         """
-        raise NotImplementedError()
+        if await self.get_api(url) is None:
+            await ctx.send(f"Unsupported platform: {url}", ephemeral=True)
+            return
+
+        await self.config.channel(ctx.channel).url.set(url)
+        if ctx.interaction:
+            await ctx.send(f"Default URL set to {url}.", ephemeral=True)
+        else:
+            await ctx.message.add_reaction("✅")
 
     @platform.command()
     async def creds(
         self,
-        ctx: commands.Context,
+        ctx: commands.GuildContext,
         uname: OptStr = None,
         pwd: OptStr = None,
         token: OptStr = None,
@@ -82,7 +526,27 @@ class Platform(commands.Cog, name="ctfcogs.Platform"):
         url: str, optional
             The URL of the platform to save credentials for
         """
-        raise NotImplementedError()
+        if token is None and (uname is None or pwd is None):
+            await ctx.send(
+                "Either a token or a username and password is required.", ephemeral=True
+            )
+            return
+
+        url = await self.resolve_url(ctx, url)
+        if url is None:
+            return
+
+        platform = await self.get_platform(ctx.channel.id, url)
+        platform.uname, platform.pwd, platform.token = uname, pwd, token
+        await self.set_platform(ctx.channel.id, url, platform)
+        self.sessions.pop((url, ctx.channel.id), None)
+        self.scoreboard_teams.pop((url, ctx.channel.id), None)
+        self.rescan()
+
+        if ctx.interaction:
+            await ctx.send(f"Credentials saved for {url}.", ephemeral=True)
+        else:
+            await ctx.message.add_reaction("✅")
 
     @platform.command()
     async def login(
@@ -135,6 +599,99 @@ class Platform(commands.Cog, name="ctfcogs.Platform"):
         """
         raise NotImplementedError()
 
+    @platform.command()
+    async def poll(
+        self,
+        ctx: commands.GuildContext,
+        enabled: bool = True,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        url: OptStr = None,
+    ) -> None:
+        """
+        Toggle background polling of a platform for the current channel
+
+        New, solved and changed challenges are announced in this channel.
+        Polling is faster between start and end, and backs off while the board is idle.
+
+        Parameters
+        ----------
+        enabled: bool, default=True
+            Whether to poll the platform
+        start: int, optional
+            Unix timestamp of the start of the CTF
+        end: int, optional
+            Unix timestamp of the end of the CTF
+        url: str, optional
+            The URL of the platform to poll
+        """
+        url = await self.resolve_url(ctx, url)
+        if url is None:
+            return
+
+        platform = await self.get_platform(ctx.channel.id, url)
+        platform.poll = enabled
+        if start is not None:
+            platform.start = start
+        if end is not None:
+            platform.end = end
+        await self.set_platform(ctx.channel.id, url, platform)
+        if not enabled:
+            await self.clear_snapshot((url, ctx.channel.id))
+        self.rescan()
+
+        if ctx.interaction:
+            state = "enabled" if enabled else "disabled"
+            await ctx.send(f"Polling {state} for {url}.", ephemeral=True)
+        else:
+            await ctx.message.add_reaction("✅")
+
+    @platform.command()
+    async def scoreboard(
+        self,
+        ctx: commands.GuildContext,
+        top: commands.Range[int, 0, 50] = 10,
+        around: commands.Range[int, 0, 10] = 2,
+        url: OptStr = None,
+    ) -> None:
+        """
+        Show the top of the scoreboard and the standings around our team
+
+        The scoreboard is cached per platform for a short time
+
+        Parameters
+        ----------
+        top: int, default=10
+            The number of standings to show from the top
+        around: int, default=2
+            The number of standings to show above and below our team
+        url: str, optional
+            The URL of the platform to show the scoreboard of
+        """
+        url = await self.resolve_url(ctx, url)
+        if url is None:
+            return
+
+        api = await self.get_api(url)
+        if api is None:
+            await ctx.send(f"Unsupported platform: {url}", ephemeral=True)
+            return
+
+        key = (url, ctx.channel.id)
+        platform = await self.get_platform(ctx.channel.id, url)
+        try:
+            async with ctx.typing():
+                cache, me = await self.get_scoreboard(key, api, platform)
+        except (ValueError, KeyError, TypeError, OSError, CTFdError) as e:
+            # the session may have expired or the response was malformed, retry from scratch
+            self.sessions.pop(key, None)
+            self.scoreboard_teams.pop(key, None)
+            await ctx.send(f"Failed to get the scoreboard of {url}: {e}", ephemeral=True)
+            return
+
+        for page in pagify(format_scoreboard(cache, me, top, around), page_length=1980):
+            await ctx.send(box(page))
+
     @platform.command()
     async def challenges(
         self,
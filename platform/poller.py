@@ -0,0 +1,136 @@
+import random
+
+from discord.utils import escape_markdown
+from pydantic import BaseModel
+from redbot.core.utils.chat_formatting import humanize_list
+from typing_extensions import Iterable, Literal, Mapping, Optional
+
+from .BaseAPI import Challenge
+
+# seconds between polls, while the CTF is running and outside of its window
+ACTIVE_INTERVAL = 60.0
+IDLE_INTERVAL = 300.0
+# idle polls grow the interval by BACKOFF, up to MAX_BACKOFF times the base interval
+BACKOFF = 1.5
+MAX_BACKOFF = 8.0
+# relative random spread so polls of different platforms don't line up
+JITTER = 0.1
+
+EventKind = Literal["new", "solved", "changed"]
+
+EVENT_LABELS: dict[EventKind, str] = {
+    "new": "🆕 New",
+    "solved": "✅ Solved",
+    "changed": "✏️ Changed",
+}
+
+
+class ChallengeEvent(BaseModel):
+    kind: EventKind
+    url: str
+    challenge: Challenge
+
+
+class PollState(BaseModel):
+    due: float
+    interval: Optional[float] = None
+
+
+def diff_challenges(
+    url: str, old: Optional[Mapping[str, Challenge]], new: Iterable[Challenge]
+) -> list[ChallengeEvent]:
+    """
+    Compare two snapshots of a challenge board
+
+    Parameters
+    ----------
+    url: str
+        The URL of the platform the snapshots belong to
+    old: Mapping[str, Challenge], optional
+        The previous snapshot keyed by challenge id, None if the board was never polled
+    new: Iterable[Challenge]
+        The current challenges on the board
+
+    Returns
+    -------
+    list[ChallengeEvent]
+        The new, solved and changed challenges, empty if there is no previous snapshot
+    """
+    if old is None:
+        return []
+
+    events: list[ChallengeEvent] = []
+    for challenge in new:
+        prev = old.get(challenge.id)
+        kind: Optional[EventKind] = None
+        if prev is None:
+            kind = "new"
+        elif challenge.is_solved and not prev.is_solved:
+            kind = "solved"
+        elif challenge.name != prev.name or (
+            None not in (challenge.description, prev.description)
+            and challenge.description != prev.description
+        ):
+            kind = "changed"
+
+        if kind is not None:
+            events.append(ChallengeEvent(kind=kind, url=url, challenge=challenge))
+
+    return events
+
+
+def is_active(start: Optional[float], end: Optional[float], now: float) -> bool:
+    """
+    Whether `now` is inside the CTF window, missing bounds are treated as open
+    """
+    return (start is None or start <= now) and (end is None or now <= end)
+
+
+def next_interval(interval: Optional[float], active: bool, changed: bool) -> float:
+    """
+    Get the interval until the next poll
+
+    Parameters
+    ----------
+    interval: float, optional
+        The previous interval, None if this is the first poll
+    active: bool
+        Whether the CTF is currently running
+    changed: bool
+        Whether the last poll found any events
+
+    Returns
+    -------
+    float
+        The base interval if anything changed, otherwise the previous interval backed off
+    """
+    base = ACTIVE_INTERVAL if active else IDLE_INTERVAL
+    if changed or interval is None:
+        return base
+    return min(max(interval * BACKOFF, base), base * MAX_BACKOFF)
+
+
+def jitter(interval: float) -> float:
+    """
+    Randomly spread an interval so polls of different platforms don't line up
+    """
+    return interval * random.uniform(1 - JITTER, 1 + JITTER)
+
+
+def format_events(events: Iterable[ChallengeEvent]) -> str:
+    """
+    Merge events into a single announcement, grouped by platform and kind
+    """
+    grouped: dict[str, dict[EventKind, dict[str, None]]] = {}
+    for event in events:
+        names = grouped.setdefault(event.url, {}).setdefault(event.kind, {})
+        names[escape_markdown(event.challenge.name)] = None
+
+    lines: list[str] = []
+    for url, kinds in grouped.items():
+        lines.append(f"**{escape_markdown(url)}**")
+        for kind, label in EVENT_LABELS.items():
+            if kind in kinds:
+                lines.append(f"{label}: {humanize_list(list(kinds[kind]))}")
+
+    return "\n".join(lines)
@@ -0,0 +1,55 @@
+from pydantic import BaseModel
+from typing_extensions import Optional
+
+from .BaseAPI import Standing
+
+# seconds a fetched scoreboard is served from the cache
+SCOREBOARD_TTL = 30.0
+
+
+class ScoreboardCache(BaseModel):
+    fetched_at: float
+    standings: list[Standing] = []
+    positions: dict[str, int] = {}
+
+
+def format_scoreboard(cache: ScoreboardCache, me: Optional[int], top: int, around: int) -> str:
+    """
+    Render the top of the scoreboard and the standings around our team
+
+    Parameters
+    ----------
+    cache: ScoreboardCache
+        The cached scoreboard to render
+    me: int, optional
+        The index of our team in the standings, None if it is not on the scoreboard
+    top: int
+        The number of standings to show from the top
+    around: int
+        The number of standings to show above and below our team
+
+    Returns
+    -------
+    str
+        One line per standing, our team marked with `>`, gaps marked with `...`
+    """
+    standings = cache.standings
+    rows = set(range(min(top, len(standings))))
+    if me is not None:
+        rows.update(range(max(me - around, 0), min(me + around + 1, len(standings))))
+
+    lines: list[str] = []
+    last = -1
+    for row in sorted(rows):
+        if row != last + 1:
+            lines.append("  ...")
+        standing = standings[row]
+        marker = ">" if row == me else " "
+        name = standing.name.replace("`", "'")[:32]
+        lines.append(f"{marker} {standing.pos:>5} {standing.score:>7}  {name}")
+        last = row
+
+    if me is None:
+        lines.append("Our team is not on the scoreboard.")
+
+    return "\n".join(lines)
@@ -0,0 +1,82 @@
+"""
+Request counts of the CTFd API against the mock server
+
+Run with: python -m unittest discover tests
+"""
+
+import sys
+import threading
+import types
+import unittest
+from pathlib import Path
+
+from typing_extensions import TYPE_CHECKING
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# the cog package is named `platform` like the stdlib module,
+# keep it from shadowing the stdlib and load it under another name
+sys.path[:] = [path for path in sys.path if Path(path or ".").resolve() != ROOT]
+package = types.ModuleType("ctfcogs_platform")
+package.__path__ = [str(ROOT / "platform")]
+sys.modules.setdefault(package.__name__, package)
+
+if TYPE_CHECKING:
+    from platform.CTFdAPI import CTFdAPI
+    from platform.CTFdMock import TOKEN, MockCTFd, MockServer
+else:
+    from ctfcogs_platform.CTFdAPI import CTFdAPI
+    from ctfcogs_platform.CTFdMock import TOKEN, MockCTFd, MockServer
+
+
+class CTFdAPITest(unittest.TestCase):
+    def serve(self, legacy: bool = False) -> MockCTFd:
+        ctfd = MockCTFd(challenges=50, solved=5, teams=10, legacy=legacy)
+        server = MockServer(("127.0.0.1", 0), ctfd)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.url = f"http://127.0.0.1:{server.server_address[1]}"
+        return ctfd
+
+    def test_board_single_request(self) -> None:
+        ctfd = self.serve()
+        session = CTFdAPI.login(self.url, token=TOKEN)
+        challenges = CTFdAPI.get_challenges(session)
+        self.assertEqual(len(challenges), 50)
+        self.assertEqual(sum(c.is_solved for c in challenges), 5)
+        self.assertEqual(ctfd.requests, {"GET /api/v1/challenges": 1})
+
+    def test_board_legacy_solves_request(self) -> None:
+        ctfd = self.serve(legacy=True)
+        session = CTFdAPI.login(self.url, token=TOKEN)
+        challenges = CTFdAPI.get_challenges(session)
+        self.assertEqual(sum(c.is_solved for c in challenges), 5)
+        self.assertEqual(
+            ctfd.requests, {"GET /api/v1/challenges": 1, "GET /api/v1/teams/me/solves": 1}
+        )
+
+    def test_challenge_by_id(self) -> None:
+        ctfd = self.serve()
+        session = CTFdAPI.login(self.url, token=TOKEN)
+        challenge = CTFdAPI.get_challenge("3", session)
+        self.assertTrue(challenge.is_solved)
+        self.assertIsNotNone(challenge.description)
+        self.assertEqual(ctfd.requests, {"GET /api/v1/challenges/<id>": 1})
+
+    def test_scoreboard_team_lookup(self) -> None:
+        ctfd = self.serve()
+        session = CTFdAPI.login(self.url, token=TOKEN)
+        team = CTFdAPI.get_account_id(session)
+        standings = [standing for page in CTFdAPI.get_scoreboard(session) for standing in page]
+        self.assertEqual([s.id for s in standings if s.is_me], [team])
+        self.assertEqual(ctfd.requests, {"GET /api/v1/teams/me": 1, "GET /api/v1/scoreboard": 1})
+
+    def test_verify(self) -> None:
+        self.serve()
+        self.assertTrue(CTFdAPI.verify(f"{self.url}/challenges"))
+        self.assertFalse(CTFdAPI.verify("not a url at all"))
+
+
+if __name__ == "__main__":
+    unittest.main()